@@ -2,6 +2,10 @@
 from __future__ import annotations
 
 import asyncio
+import fcntl
+import functools
+import importlib.util
+import itertools
 import json
 import os
 import random
@@ -9,18 +13,50 @@ import re
 import shutil
 import signal
 import subprocess
+import sys
+import tempfile
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Literal, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Literal, Tuple, Union
 from urllib.parse import urlparse, urlunparse
 
+try:
+    import orjson  # optional: faster parsing of yt-dlp's playlist JSON
+except ImportError:
+    orjson = None
+
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.widgets import Footer, Header, Input, ListItem, ListView, Static
 
 AUDIO_EXTS = {".mp3", ".m4a", ".opus", ".webm", ".flac", ".wav", ".ogg", ".aac"}
 MAX_SHOW = 400
+# playlist items downloaded/converted concurrently
+DOWNLOAD_WORKERS = max(1, min(os.cpu_count() or 1, 4))
+
+
+def _ffmpeg_threads() -> int:
+    # split the cores between concurrent encodes instead of every ffmpeg grabbing all of them
+    try:
+        return max(1, int(os.environ["PERSONALFM_FFMPEG_THREADS"]))
+    except (KeyError, ValueError):
+        return max(1, (os.cpu_count() or 4) // DOWNLOAD_WORKERS)
+
+
+FFMPEG_THREADS = _ffmpeg_threads()
+FFPROBE_TIMEOUT = 2.0
+SCAN_BATCH = 500  # tracks handed to the UI per batch while a scan is running
+# Directories never descended into while scanning (dot-dirs are skipped too).
+HIDE_DIRS = {"node_modules", "__pycache__", "venv", ".venv", "site-packages"}
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "personalfm"
+SCAN_INDEX_PATH = CACHE_DIR / "index.json"
+# Bump whenever the row layout or normalize_for_search changes so old rows are rebuilt.
+SCAN_INDEX_VERSION = 1
+DURATIONS_PATH = CACHE_DIR / "durations.json"
+
+json_loads = orjson.loads if orjson is not None else json.loads
 
 BANNER = r"""\
 
@@ -32,7 +68,7 @@ BANNER = r"""\
 ╚═╝     ╚═╝     ╚═╝
 
   Enter: play   Space: pause/resume   n: next   p: previous   s: stop   r: rescan   +: add   -: remove
-  x: shuffle   d: download (mp3)   c: cancel dl   q: quit
+  R: full rescan   x: shuffle   d: download (mp3)   c: cancel dl   q: quit
 """
 
 TUX_ASCII = r"""\
@@ -46,10 +82,15 @@ TUX_ASCII = r"""\
 """
 
 
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_MULTISPACE = re.compile(r"\s+")
+_FNAME_BAD = re.compile(r"[\\/:*?\"<>|]+")
+_MARKUP_RE = re.compile(r"\[/?[^\]]+\]")  # Rich markup tags like [dim]...[/dim] in labels
+_YTDLP_PCT_RE = re.compile(rb"\[download\]\s+(\d+(?:\.\d+)?)%")
+
+
 def normalize_for_search(s: str) -> str:
-    s = s.lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return " ".join(s.split())
+    return " ".join(_NON_ALNUM.sub(" ", s.lower()).split())
 
 
 def squash_spaces(s: str) -> str:
@@ -68,29 +109,121 @@ def clamp(v: float, lo: float, hi: float) -> float:
     return lo if v < lo else hi if v > hi else v
 
 
-def get_duration_seconds(path: Path) -> Optional[float]:
-    if not shutil.which("ffprobe"):
-        return None
+BAR_MAX = 1024
+_BAR_FILL = "█" * BAR_MAX
+_BAR_EMPTY = "░" * BAR_MAX
+
+
+def sweep_bar(width: int, pos: int, block: int) -> str:
+    """Bar with cells [pos, pos + block) filled; pos may be negative or past the end."""
+    lo = min(width, max(0, pos))
+    hi = max(lo, min(width, pos + block))
+    return _BAR_EMPTY[:lo] + _BAR_FILL[:hi - lo] + _BAR_EMPTY[:width - hi]
+
+
+@functools.lru_cache(maxsize=4096)
+def _probe_duration(path_str: str, mtime_ns: int, size: int) -> Optional[float]:
+    # mtime_ns/size only take part in the cache key, so an edited file is probed again
     try:
         out = subprocess.check_output(
             [
                 "ffprobe",
                 "-v",
                 "error",
+                "-probesize",
+                "1M",
+                "-analyzeduration",
+                "1M",
                 "-show_entries",
                 "format=duration",
                 "-of",
                 "default=nw=1:nk=1",
-                str(path),
+                path_str,
             ],
             stderr=subprocess.DEVNULL,
-            timeout=2,
-        ).decode("utf-8", "ignore").strip()
+            timeout=FFPROBE_TIMEOUT,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+        ).strip()
         return float(out) if out else None
     except Exception:
         return None
 
 
+def get_duration_seconds(path: Path) -> Optional[float]:
+    if not shutil.which("ffprobe"):
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _probe_duration(str(path), st.st_mtime_ns, st.st_size)
+
+
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)  # fcntl only exports it on Python 3.12+
+
+
+def _kernel_copy(src: Path, dst: Path, size: Optional[int] = None) -> bool:
+    """Reflink, else copy_file_range; the data never passes through user space. False if neither works."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        sfd, dfd = fsrc.fileno(), fdst.fileno()
+        try:
+            fcntl.ioctl(dfd, FICLONE, sfd)  # btrfs/xfs: shares extents, no data copied at all
+            return True
+        except OSError:
+            pass
+        try:
+            left = os.fstat(sfd).st_size if size is None else size
+            while left > 0:
+                n = os.copy_file_range(sfd, dfd, left)
+                if n == 0:
+                    break
+                left -= n
+            return left == 0
+        except (OSError, AttributeError):
+            return False
+
+
+def fast_copy(src: Path, dst: Path, st: Optional[os.stat_result] = None) -> None:
+    """Copy src to dst with its mode and times; st, if the caller already has it, spares re-stat()ing src."""
+    if st is None:
+        st = os.stat(src)
+    if not _kernel_copy(src, dst, st.st_size):
+        shutil.copyfile(src, dst)  # sendfile() on Linux
+    os.chmod(dst, st.st_mode & 0o7777)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _reap_blocking(pid: int, grace: float) -> None:
+    """Wait up to grace seconds for child pid (a process group leader) to exit, then SIGKILL its group."""
+    deadline = time.monotonic() + grace
+    while True:
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                return
+        except ChildProcessError:
+            return  # already reaped, e.g. by asyncio's child watcher
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(0.02)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    except (ProcessLookupError, ChildProcessError):
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def load_yt_dlp():
+    """The yt_dlp module if importable (imported once, lazily), else None."""
+    try:
+        import yt_dlp
+    except ImportError:
+        return None
+    return yt_dlp
+
+
 def normalize_youtube_url(url: str) -> str:
     try:
         u = url.strip()
@@ -106,8 +239,8 @@ def normalize_youtube_url(url: str) -> str:
 
 
 def safe_filename(name: str, max_len: int = 140) -> str:
-    name = re.sub(r"[\\/:*?\"<>|]+", "_", name).strip()
-    name = re.sub(r"\s+", " ", name).strip()
+    name = _FNAME_BAD.sub("_", name).strip()
+    name = _MULTISPACE.sub(" ", name).strip()
     if not name:
         name = "track"
     if len(name) > max_len:
@@ -118,7 +251,7 @@ def safe_filename(name: str, max_len: int = 140) -> str:
 SourceType = Literal["local", "youtube"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Track:
     source: SourceType
     uri: str  # local path or watch URL
@@ -127,26 +260,37 @@ class Track:
     norm_parent: str
     squashed_name: str
     squashed_parent: str
+    sort_key: Tuple[str, str] = ("", "")  # (parent, name) lowercased; local tracks only
 
     @staticmethod
-    def from_path(p: Path) -> "Track":
-        name = p.name
-        parent = str(p.parent)
-        try:
-            rel_parent = str(p.parent.relative_to(Path.cwd()))
-        except Exception:
+    def from_path(p: Union[Path, str], cwd: Optional[str] = None) -> "Track":
+        """
+        cwd: resolved working directory as a string; scans pass it in once
+        instead of paying for Path.cwd() + relative_to() on every file.
+        """
+        uri = os.fspath(p)
+        name = os.path.basename(uri)
+        parent = os.path.dirname(uri)
+        if cwd is None:
+            cwd = str(Path.cwd().resolve())
+        if parent == cwd:
+            rel_parent = "."
+        elif parent.startswith(cwd) and parent[len(cwd):len(cwd) + 1] == os.sep:
+            rel_parent = parent[len(cwd) + 1:]
+        else:
             rel_parent = parent
         label = f"{name}  [dim]({rel_parent})[/dim]"
         nn = normalize_for_search(name)
         np = normalize_for_search(parent)
         return Track(
             source="local",
-            uri=str(p),
+            uri=uri,
             label=label,
             norm_name=nn,
             norm_parent=np,
             squashed_name=squash_spaces(nn),
             squashed_parent=squash_spaces(np),
+            sort_key=(parent.lower(), name.lower()),
         )
 
     @staticmethod
@@ -166,49 +310,317 @@ class Track:
         )
 
 
-def scan_tracks_recursive(root: Path) -> List[Track]:
+def _scandir_recursive(path: str) -> Iterator[os.DirEntry]:
+    """
+    Yield audio file entries below path. DirEntry caches the d_type from getdents,
+    so is_dir()/is_file() don't cost an extra stat() per entry like os.walk + Path.is_file() did.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError:  # PermissionError included
+        return
+    with it:
+        for entry in it:
+            try:
+                # directory symlinks are not descended into (no loops); file symlinks are listed
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name.startswith(".") or entry.name in HIDE_DIRS:
+                        continue
+                    yield from _scandir_recursive(entry.path)
+                    continue
+                # plain string ops here: this runs for every file in the tree
+                name = entry.name
+                dot = name.rfind(".")
+                if dot > 0 and name[dot:].lower() in AUDIO_EXTS and entry.is_file():
+                    yield entry  # is_file() only costs a stat() for symlinks
+            except OSError:
+                continue
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # unique tmp name, so overlapping writers never share an inode
+        fd, tmp = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except Exception:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def clear_scan_cache() -> None:
+    try:
+        SCAN_INDEX_PATH.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _track_from_row(path: str, row: object, st: os.stat_result) -> Optional[Track]:
+    """Rebuild a Track from an index row, or None if the row is stale or malformed."""
+    if not isinstance(row, list) or len(row) != 9:
+        return None
+    if row[0] != st.st_mtime_ns or row[1] != st.st_size:
+        return None
+    fields = row[2:]
+    if not all(isinstance(x, str) for x in fields):
+        return None
+    label, nn, np, sn, sp, sort_dir, sort_name = fields
+    return Track("local", path, label, nn, np, sn, sp, (sort_dir, sort_name))
+
+
+def _duration_from_row(row: object, st: os.stat_result) -> Optional[float]:
+    """Seconds from a durations.json row, or None if the row is stale or malformed."""
+    if not isinstance(row, list) or len(row) != 3:
+        return None
+    mtime_ns, size, dur = row
+    if type(mtime_ns) is not int or type(size) is not int:
+        return None
+    if mtime_ns != st.st_mtime_ns or size != st.st_size:
+        return None
+    if type(dur) not in (int, float) or not 0 < dur < float("inf"):  # also rejects NaN
+        return None
+    return float(dur)
+
+
+def _utf8_safe(path: str) -> bool:
+    # undecodable filenames come back as surrogate escapes, which json can't write as UTF-8
+    try:
+        path.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def iter_tracks_recursive(root: Path, *, use_cache: bool = True) -> Iterator[Track]:
     """
     Recursive scan that tolerates permission errors and avoids crashing on weird filesystem entries.
-    Uses os.walk for robustness.
+    Uses os.scandir so file type checks come from the cached dirent instead of a stat() per file.
+    Tracks are yielded in directory order, unsorted.
+
+    Built tracks are kept in SCAN_INDEX_PATH keyed by (path, mtime, size), so a rescan only
+    rebuilds entries whose file changed since the last run. The index is written once the
+    generator is exhausted.
     """
-    tracks: List[Track] = []
     root = root.resolve()
+    cwd = str(Path.cwd().resolve())
+
+    index = _read_json(SCAN_INDEX_PATH) if use_cache else {}
+    cached = index.get(str(root))
+    # labels are relative to cwd, so an index written from another cwd is useless
+    usable = (
+        isinstance(cached, dict)
+        and cached.get("version") == SCAN_INDEX_VERSION
+        and cached.get("cwd") == cwd
+        and isinstance(cached.get("rows"), dict)
+    )
+    old_rows = cached["rows"] if usable else {}
+    rows: Dict[str, list] = {}
+
+    for entry in _scandir_recursive(str(root)):
+        try:
+            st = entry.stat()  # the target's, for symlinked files
+            row = old_rows.get(entry.path)
+            t = _track_from_row(entry.path, row, st)
+            if t is None:
+                t = Track.from_path(entry.path, cwd)
+                row = [st.st_mtime_ns, st.st_size, t.label, t.norm_name, t.norm_parent,
+                       t.squashed_name, t.squashed_parent, *t.sort_key]
+        except Exception:
+            continue
+        if _utf8_safe(entry.path):
+            rows[entry.path] = row
+        yield t
 
-    for dirpath, dirnames, filenames in os.walk(root, topdown=True, followlinks=False):
-        # prune common heavy dirs if you want (leave empty to scan everything)
-        # Example: skip .git / node_modules if you like
-        # dirnames[:] = [d for d in dirnames if d not in {".git", "node_modules"}]
+    if use_cache and rows != old_rows:
+        index[str(root)] = {"version": SCAN_INDEX_VERSION, "cwd": cwd, "rows": rows}
+        _write_json_atomic(SCAN_INDEX_PATH, index)
 
-        for fn in filenames:
-            try:
-                p = Path(dirpath) / fn
-                if p.suffix.lower() in AUDIO_EXTS and p.is_file():
-                    tracks.append(Track.from_path(p))
-            except Exception:
-                continue
 
-    tracks.sort(key=lambda t: (str(Path(t.uri).parent).lower(), Path(t.uri).name.lower()))
+def scan_tracks_recursive(root: Path, *, use_cache: bool = True) -> List[Track]:
+    tracks = list(iter_tracks_recursive(root, use_cache=use_cache))
+    tracks.sort(key=lambda t: t.sort_key)
     return tracks
 
 
+def trigrams(s: str) -> set:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+@dataclass(frozen=True, slots=True)
+class SearchIndex:
+    """
+    Column copies of the searchable fields (same order as the track list) plus trigram maps.
+    name_grams: trigram -> ascending ids of tracks whose squashed name contains it.
+    parent_grams: trigram -> ids of distinct squashed parents containing it; parent_tracks[pid]
+    lists the tracks in that directory. Each directory is indexed once, not once per track in it.
+    Trigrams held by more than half of the tracks (or parents), such as the shared cwd prefix,
+    are left out and recorded in dense_names / dense_parents: they barely narrow a query.
+    """
+    name_grams: Dict[str, List[int]]
+    parent_grams: Dict[str, List[int]]
+    parent_tracks: List[List[int]]
+    dense_names: set
+    dense_parents: set
+    sq_names: List[str]
+    sq_parents: List[str]
+
+
+EMPTY_SEARCH_INDEX = SearchIndex({}, {}, [], set(), set(), [], [])
+
+
+def _add_grams(table: Dict[str, List[int]], s: str, i: int) -> None:
+    for g in trigrams(s):
+        bucket = table.get(g)
+        if bucket is None:
+            table[g] = [i]
+        else:
+            bucket.append(i)
+
+
+def _drop_dense(table: Dict[str, List[int]], n: int) -> set:
+    dense = {g for g, bucket in table.items() if len(bucket) * 2 > n}
+    for g in dense:
+        del table[g]
+    return dense
+
+
+def build_search_index(tracks: List[Track]) -> SearchIndex:
+    name_grams: Dict[str, List[int]] = {}
+    parent_ids: Dict[str, int] = {}
+    parent_tracks: List[List[int]] = []
+    for i, t in enumerate(tracks):
+        _add_grams(name_grams, t.squashed_name, i)
+        pid = parent_ids.get(t.squashed_parent)
+        if pid is None:
+            pid = parent_ids[t.squashed_parent] = len(parent_tracks)
+            parent_tracks.append([])
+        parent_tracks[pid].append(i)
+
+    parent_grams: Dict[str, List[int]] = {}
+    for parent, pid in parent_ids.items():
+        _add_grams(parent_grams, parent, pid)
+
+    return SearchIndex(
+        name_grams=name_grams,
+        parent_grams=parent_grams,
+        parent_tracks=parent_tracks,
+        dense_names=_drop_dense(name_grams, len(tracks)),
+        dense_parents=_drop_dense(parent_grams, len(parent_tracks)),
+        sq_names=[t.squashed_name for t in tracks],
+        sq_parents=[t.squashed_parent for t in tracks],
+    )
+
+
+def _intersect_grams(grams: set, table: Dict[str, List[int]], dense: set, limit: int) -> Optional[set]:
+    """Superset of the ids holding every non-dense gram; None when every bucket is over limit (too broad to help)."""
+    buckets = []
+    for g in grams:
+        if g in dense:
+            continue
+        bucket = table.get(g)
+        if bucket is None:
+            return set()
+        buckets.append(bucket)
+    if not buckets:
+        return None
+    buckets.sort(key=len)
+    if len(buckets[0]) > limit:
+        return None
+    ids = set(buckets[0])
+    for bucket in buckets[1:]:
+        # candidates are verified by substring test afterwards, so a much longer bucket
+        # costs more to walk than it can save; a superset is all that is needed
+        if not ids or len(bucket) > 8 * len(ids):
+            break
+        ids.intersection_update(bucket)
+    return ids
+
+
+def search_candidates(index: SearchIndex, q_sq: str) -> Optional[List[int]]:
+    """
+    Ascending track ids that may contain q_sq (len >= 3) in their squashed name or parent.
+    None means the index can't narrow the query enough to beat a straight scan, which for
+    such common queries stops after MAX_SHOW hits anyway.
+    """
+    grams = trigrams(q_sq)
+    limit = len(index.sq_names) // 8
+    names = _intersect_grams(grams, index.name_grams, index.dense_names, limit)
+    if names is None:
+        return None
+    parents = _intersect_grams(grams, index.parent_grams, index.dense_parents, len(index.parent_tracks) // 8)
+    if parents is None:
+        return None
+    total = len(names) + sum(len(index.parent_tracks[pid]) for pid in parents)
+    if total > limit:
+        return None
+    for pid in parents:
+        names.update(index.parent_tracks[pid])
+    return sorted(names)
+
+
 def find_player() -> Optional[Tuple[str, List[str]]]:
-    if shutil.which("mpv"):
-        return ("mpv", ["mpv", "--no-video", "--quiet", "--audio-display=no"])
-    if shutil.which("ffplay"):
-        return ("ffplay", ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"])
+    # cmd[0] is the resolved path, so each track start skips the PATH search in exec
+    mpv = shutil.which("mpv")
+    if mpv:
+        return ("mpv", [mpv, "--no-video", "--quiet", "--audio-display=no"])
+    ffplay = shutil.which("ffplay")
+    if ffplay:
+        return ("ffplay", [ffplay, "-nodisp", "-autoexit", "-loglevel", "quiet"])
     return None
 
 
-def fetch_youtube_playlist_tracks(url: str, timeout_s: int = 25) -> List[Track]:
+async def run_capture(cmd: List[str], timeout_s: float, *, merge_stderr: bool = False) -> bytes:
+    """
+    Async stand-in for subprocess.check_output: the event loop keeps running while the child works.
+    Raises CalledProcessError on non-zero exit and RuntimeError on timeout (the child is killed).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.DEVNULL,
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout_s)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise RuntimeError(f"{cmd[0]} timed out after {timeout_s:g}s.") from None
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=out)
+    return out
+
+
+async def fetch_youtube_playlist_tracks_async(url: str, timeout_s: int = 25) -> List[Track]:
     if not shutil.which("yt-dlp"):
         raise RuntimeError("yt-dlp not found. Install it to load YouTube playlists.")
     url = normalize_youtube_url(url)
     cmd = ["yt-dlp", "--flat-playlist", "-J", "--no-warnings", url]
-    raw = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, timeout=timeout_s)
-    data = json.loads(raw.decode("utf-8", "ignore"))
+    raw = await run_capture(cmd, timeout_s)
+    data = json_loads(raw)  # both parsers take the bytes as-is, no separate decode copy
 
     playlist_title = data.get("title") or "YouTube"
-    entries = data.get("entries") or []
+    entries = data.get("entries") or ()
 
     def to_watch_url(entry: dict) -> Optional[str]:
         w = entry.get("webpage_url")
@@ -243,7 +655,7 @@ def fetch_youtube_playlist_tracks(url: str, timeout_s: int = 25) -> List[Track]:
     return out
 
 
-def resolve_youtube_audio_stream(watch_url: str, timeout_s: int = 30) -> str:
+async def resolve_youtube_audio_stream_async(watch_url: str, timeout_s: int = 30) -> str:
     if not shutil.which("yt-dlp"):
         raise RuntimeError("yt-dlp not found (required for YouTube playback).")
 
@@ -252,7 +664,7 @@ def resolve_youtube_audio_stream(watch_url: str, timeout_s: int = 30) -> str:
     cmd = ["yt-dlp", "-f", fmt, "-g", "--no-warnings", watch_url]
 
     try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, timeout=timeout_s).decode("utf-8", "ignore").strip()
+        out = (await run_capture(cmd, timeout_s, merge_stderr=True)).decode("utf-8", "ignore").strip()
     except subprocess.CalledProcessError as e:
         msg = (e.output or b"").decode("utf-8", "ignore").strip()
         msg = msg[-1000:] if len(msg) > 1000 else msg
@@ -276,17 +688,17 @@ class ProgressPanel(Static):
         shuffle_on: bool,
     ) -> str:
         safe_title = title if len(title) <= 80 else (title[:77] + "…")
-        bar_width = max(16, width_chars - 12)
+        bar_width = min(BAR_MAX, max(16, width_chars - 12))
 
         if duration and duration > 0:
             pct = clamp(elapsed / duration, 0.0, 1.0)
             filled = int(pct * bar_width)
-            bar = "█" * filled + "░" * (bar_width - filled)
+            bar = _BAR_FILL[:filled] + _BAR_EMPTY[:bar_width - filled]
             right = fmt_mmss(duration)
         else:
             block = max(6, bar_width // 6)
             pos = int((elapsed * 6) % max(1, (bar_width + block))) - block
-            bar = "".join("█" if pos <= i < pos + block else "░" for i in range(bar_width))
+            bar = sweep_bar(bar_width, pos, block)
             right = "??:??"
 
         left = fmt_mmss(elapsed)
@@ -329,10 +741,10 @@ class DownloadPanel(Static):
             return "[dim]No download running. Press d to download playlist as MP3.[/dim]"
 
         elapsed = max(0.0, time.monotonic() - started_at)
-        width = max(24, self.size.width - 18)
+        width = min(BAR_MAX, max(24, self.size.width - 18))
         block = max(6, width // 6)
         pos = int((elapsed * 8) % max(1, (width + block))) - block
-        bar = "".join("█" if pos <= i < pos + block else "░" for i in range(width))
+        bar = sweep_bar(width, pos, block)
 
         return (
             f"[b]DOWNLOADING[/b]  {cur}/{total}  [dim](press c to cancel)[/dim]\n"
@@ -381,6 +793,7 @@ class MusicTUI(App):
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("r", "rescan", "Rescan"),
+        ("R", "clear_cache", "Full rescan"),
         ("s", "stop", "Stop"),
         ("+", "add_to_playlist", "Add"),
         ("-", "remove_from_playlist", "Remove"),
@@ -393,15 +806,32 @@ class MusicTUI(App):
     matches_view: List[Track] = []
     playlist: List[Track] = []
 
-    _search_timer = None
+    _search_index: SearchIndex = EMPTY_SEARCH_INDEX
+    _track_items: List[ListItem] = []
+    _track_labels: List[Static] = []
+    _track_rows_shown: int = 0
+    _scan_task: Optional[asyncio.Task] = None
+    _playlist_task: Optional[asyncio.Task] = None
+
+    _search_event: Optional[asyncio.Event] = None
+    _search_task: Optional[asyncio.Task] = None
     _pending_query: str = ""
 
     _player_name: Optional[str] = None
     _player_cmd: Optional[List[str]] = None
 
-    _proc: Optional[subprocess.Popen] = None
+    _proc: Optional[asyncio.subprocess.Process] = None
+    _start_task: Optional[asyncio.Task] = None
+    _start_gen: int = 0
+    _exit_watch: Optional[asyncio.Task] = None
+    _bg_tasks: set = set()
+    _dying_players: set = set()  # players sent SIGTERM whose async reaper hasn't finished
     _playing_track: Optional[Track] = None
-    _play_start: float = 0.0
+    _playing_title: str = ""
+    _progress_key: Optional[tuple] = None
+    _dur_cache: Dict[str, list] = {}  # path -> [mtime_ns, size, seconds], persisted in DURATIONS_PATH
+    _dur_write_lock: Optional[asyncio.Lock] = None
+    _elapsed_origin: float = 0.0  # play start shifted forward by total paused time
     _duration: Optional[float] = None
 
     _play_source: Optional[PlaySource] = None
@@ -412,19 +842,24 @@ class MusicTUI(App):
 
     _paused: bool = False
     _paused_at: float = 0.0
-    _paused_total: float = 0.0
 
     _download_prompt_active: bool = False
     _download_in_progress: bool = False
-    _download_cancel_requested: bool = False
     _download_started_at: float = 0.0
     _download_cur: int = 0
     _download_total: int = 0
     _download_title: str = ""
     _download_task: Optional[asyncio.Task] = None
-    _download_proc: Optional[subprocess.Popen] = None
+    _download_procs: set = set()
+    _ytdlp_path: Optional[str] = None
+    _ffmpeg_path: Optional[str] = None
+    _download_cancel_event: Optional[asyncio.Event] = None
     _prev_focus_id: Optional[str] = None
 
+    _progress_widget: Optional[ProgressPanel] = None
+    _playlist_widget: Optional[ListView] = None
+    _download_widget: Optional[DownloadPanel] = None
+
     def set_status(self, msg: str) -> None:
         try:
             self.query_one("#status", Static).update(msg)
@@ -466,14 +901,14 @@ class MusicTUI(App):
     def _install_signal_handlers(self) -> None:
         def _exit_handler(signum, frame=None):
             try:
-                self._stop_playback()
+                self._stop_playback(blocking=True)
                 self._cancel_download_kill_proc()
             finally:
                 raise SystemExit(0)
 
         def _tstp_handler(signum, frame=None):
             try:
-                self._stop_playback()
+                self._stop_playback(blocking=True)
                 self._cancel_download_kill_proc()
             finally:
                 signal.signal(signal.SIGTSTP, signal.SIG_DFL)
@@ -502,7 +937,11 @@ class MusicTUI(App):
             with Vertical(id="left"):
                 yield Input(placeholder="Search… (ed sheeran matches ed_sheeran)", id="search")
                 yield Static("No audio files found / no matches.", id="tracks_empty", classes="dim")
-                yield ListView(id="tracks")
+                self._track_labels = [Static("") for _ in range(MAX_SHOW)]
+                self._track_items = [ListItem(label, disabled=True) for label in self._track_labels]
+                for item in self._track_items:
+                    item.display = False
+                yield ListView(*self._track_items, id="tracks")
 
             with Vertical(id="right"):
                 yield Static("[b]Playlist[/b]  [dim](Tab here, Enter plays, - removes)[/dim]")
@@ -519,32 +958,39 @@ class MusicTUI(App):
         yield Footer()
 
     def on_mount(self) -> None:
+        # widgets touched on every tick / track change; resolve them once instead of per call
+        self._progress_widget = self.query_one("#progress", ProgressPanel)
+        self._playlist_widget = self.query_one("#playlist", ListView)
+        self._download_widget = self.query_one("#download", DownloadPanel)
+
+        self._bg_tasks = set()
+        self._dying_players = set()
+        self._dur_cache = _read_json(DURATIONS_PATH)
+        self._dur_write_lock = asyncio.Lock()
         self._install_signal_handlers()
 
         found = find_player()
         if found:
             self._player_name, self._player_cmd = found
 
-        self.rescan()
+        self.start_rescan("Ready. Space pause/resume. n/p next/prev.")
+
+        self._search_event = asyncio.Event()
+        self._search_task = asyncio.create_task(self._search_loop())
 
         self.set_interval(0.25, self._tick_progress)
         self.set_interval(0.20, self._tick_download_panel)
 
-        self.query_one("#download", DownloadPanel).set_idle()
-        self.query_one("#progress", ProgressPanel).set_idle(shuffle_on=self._shuffle_on)
-        self.set_status("Ready. Space pause/resume. n/p next/prev.")
+        self._download_widget.set_idle()
+        self._progress_widget.set_idle(shuffle_on=self._shuffle_on)
 
     # ---------- Inputs ----------
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id != "search":
             return
         self._pending_query = (event.value or "")
-        if self._search_timer is not None:
-            try:
-                self._search_timer.stop()
-            except Exception:
-                pass
-        self._search_timer = self.set_timer(0.18, self._apply_search)
+        if self._search_event is not None:
+            self._search_event.set()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input.id == "search":
@@ -555,7 +1001,7 @@ class MusicTUI(App):
             url = (event.value or "").strip()
             if not url:
                 return
-            self._load_youtube_playlist(url)
+            self._playlist_task = asyncio.create_task(self._load_youtube_playlist(url))
             self.query_one("#playlist", ListView).focus()
             return
 
@@ -568,26 +1014,46 @@ class MusicTUI(App):
                 self.set_status("Download cancelled (empty path).")
             return
 
-    def _apply_search(self) -> None:
-        raw = self._pending_query.strip()
-        if not raw:
-            self.matches_all = list(self.tracks)
+    async def _search_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._search_event.wait()
+            # debounce: wait until keystrokes stop arriving for a moment
+            while self._search_event.is_set():
+                self._search_event.clear()
+                await asyncio.sleep(0.15)
+            try:
+                # tracks and index are swapped together on the loop thread; hand the worker a consistent pair
+                matches = await loop.run_in_executor(
+                    None, self._filter_tracks, self._pending_query, self.tracks, self._search_index
+                )
+            except Exception as e:
+                self.set_status(f"Search failed: {e}")
+                continue
+            if self._search_event.is_set():
+                continue  # query changed while filtering; this result is stale
+            self.matches_all = matches
             self._refresh_view(reset_index=True)
-            return
+
+    def _filter_tracks(self, query: str, tracks: List[Track], index: SearchIndex) -> List[Track]:
+        raw = query.strip()
+        if not raw:
+            return tracks[:MAX_SHOW]
 
         q_norm = normalize_for_search(raw)
         q_sq = squash_spaces(q_norm)
 
-        self.matches_all = [
-            t for t in self.tracks
-            if (
-                q_norm in t.norm_name
-                or q_norm in t.norm_parent
-                or q_sq in t.squashed_name
-                or q_sq in t.squashed_parent
-            )
-        ]
-        self._refresh_view(reset_index=True)
+        ids: Iterable[int] = range(len(tracks))
+        if len(q_sq) >= 3:
+            candidates = search_candidates(index, q_sq)
+            if candidates is not None:
+                ids = candidates
+
+        # a hit on a normalized field is always a hit on its squashed form, so the
+        # squashed columns alone decide; stop once a screenful is found
+        names, parents = index.sq_names, index.sq_parents
+        hits = (i for i in ids if q_sq in names[i] or q_sq in parents[i])
+        return [tracks[i] for i in itertools.islice(hits, MAX_SHOW)]
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         if event.list_view.id == "playlist":
@@ -602,17 +1068,69 @@ class MusicTUI(App):
             self._start_track(t, source="tracks", playlist_index=None)
 
     # ---------- Scan / Populate ----------
-    def rescan(self) -> None:
-        self.tracks = scan_tracks_recursive(Path.cwd())
+    def start_rescan(self, done_msg: str = "Rescanned local audio files.") -> None:
+        if self._scan_task is not None and not self._scan_task.done():
+            self.set_status("Scan already running…")
+            return
+        self._scan_task = asyncio.create_task(self.rescan_async(done_msg))
+
+    async def rescan_async(self, done_msg: str) -> None:
+        self.set_status("Scanning…")
+        loop = asyncio.get_running_loop()
+        batches: asyncio.Queue = asyncio.Queue()
+
+        def produce() -> None:
+            # worker thread: hand batches to the loop so the list fills in while the walk runs
+            batch: List[Track] = []
+            try:
+                for t in iter_tracks_recursive(Path.cwd()):
+                    batch.append(t)
+                    if len(batch) >= SCAN_BATCH:
+                        loop.call_soon_threadsafe(batches.put_nowait, batch)
+                        batch = []
+                if batch:
+                    loop.call_soon_threadsafe(batches.put_nowait, batch)
+            finally:
+                loop.call_soon_threadsafe(batches.put_nowait, None)
+
+        def finish(tracks: List[Track]) -> SearchIndex:
+            tracks.sort(key=lambda t: t.sort_key)
+            return build_search_index(tracks)
+
+        walk = loop.run_in_executor(None, produce)
+        tracks: List[Track] = []
+        while (batch := await batches.get()) is not None:
+            tracks.extend(batch)
+            self.set_status(f"Scanning… {len(tracks)} files")
+            if len(self.matches_view) < MAX_SHOW:
+                # partial, unsorted preview; self.tracks is only swapped once the index matches it
+                self.matches_all = tracks[:MAX_SHOW]
+                self._refresh_view()
+        try:
+            await walk
+            index = await loop.run_in_executor(None, finish, tracks)
+        except Exception as e:
+            self.set_status(f"Scan failed: {e}")
+            return
+        self.tracks, self._search_index = tracks, index
         self.matches_all = list(self.tracks)
         self._refresh_view(reset_index=True)
+        self.set_status(done_msg)
 
     def _refresh_view(self, reset_index: bool = False) -> None:
         self.matches_view = self.matches_all[:MAX_SHOW]
         tracks_lv = self.query_one("#tracks", ListView)
         empty = self.query_one("#tracks_empty", Static)
 
-        tracks_lv.clear()
+        # reuse the MAX_SHOW rows built in compose(): relabel the visible ones, hide the tail
+        n = len(self.matches_view)
+        for i, t in enumerate(self.matches_view):
+            self._track_labels[i].update(t.label)
+        for i in range(min(n, self._track_rows_shown), max(n, self._track_rows_shown)):
+            item = self._track_items[i]
+            item.display = i < n
+            item.disabled = i >= n  # keeps cursor navigation off hidden rows
+        self._track_rows_shown = n
 
         if not self.matches_view:
             tracks_lv.styles.display = "none"
@@ -622,10 +1140,7 @@ class MusicTUI(App):
         empty.styles.display = "none"
         tracks_lv.styles.display = "block"
 
-        for t in self.matches_view:
-            tracks_lv.append(ListItem(Static(t.label)))
-
-        if reset_index or tracks_lv.index is None:
+        if reset_index or tracks_lv.index is None or tracks_lv.index >= n:
             tracks_lv.index = 0
 
     def _refresh_playlist(self, reset_index: bool = False) -> None:
@@ -657,12 +1172,12 @@ class MusicTUI(App):
         return idx if 0 <= idx < len(self.playlist) else None
 
     # ---------- YouTube playlist ----------
-    def _load_youtube_playlist(self, url: str) -> None:
+    async def _load_youtube_playlist(self, url: str) -> None:
         self.set_status("Loading YouTube playlist…")
         self._shuffle_on = False
         self._playlist_original = None
         try:
-            items = fetch_youtube_playlist_tracks(url)
+            items = await fetch_youtube_playlist_tracks_async(url)
             if not items:
                 self.set_status("No playlist items found.")
                 return
@@ -675,8 +1190,19 @@ class MusicTUI(App):
 
     # ---------- Actions ----------
     def action_rescan(self) -> None:
-        self.rescan()
-        self.set_status("Rescanned local audio files.")
+        self.start_rescan()
+
+    def action_clear_cache(self) -> None:
+        if self._scan_task is not None and not self._scan_task.done():
+            # the running scan would write back the rows it read before the clear
+            self.set_status("Scan already running… press R again once it finishes.")
+            return
+        try:
+            clear_scan_cache()
+        except OSError as e:
+            self.set_status(f"Couldn't clear scan cache: {e}")
+            return
+        self.start_rescan("Cleared scan cache and rescanned.")
 
     def action_stop(self) -> None:
         self._stop_playback()
@@ -729,7 +1255,7 @@ class MusicTUI(App):
         if nxt >= len(self.playlist):
             self.set_status("End of playlist.")
             return
-        plv = self.query_one("#playlist", ListView)
+        plv = self._playlist_widget
         plv.index = nxt
         self._start_track(self.playlist[nxt], source="playlist", playlist_index=nxt)
 
@@ -744,13 +1270,13 @@ class MusicTUI(App):
         if prv < 0:
             self.set_status("Start of playlist.")
             return
-        plv = self.query_one("#playlist", ListView)
+        plv = self._playlist_widget
         plv.index = prv
         self._start_track(self.playlist[prv], source="playlist", playlist_index=prv)
 
     # ---------- Pause / Resume ----------
     def action_toggle_pause(self) -> None:
-        if not self._proc or self._proc.poll() is not None:
+        if not self._proc or self._proc.returncode is not None:
             self.set_status("Nothing playing.")
             return
         try:
@@ -762,7 +1288,7 @@ class MusicTUI(App):
             else:
                 os.killpg(self._proc.pid, signal.SIGCONT)
                 now = time.monotonic()
-                self._paused_total += max(0.0, now - self._paused_at)
+                self._elapsed_origin += max(0.0, now - self._paused_at)
                 self._paused = False
                 self.set_status("Resumed.")
         except Exception as e:
@@ -806,20 +1332,24 @@ class MusicTUI(App):
         if not self._download_in_progress:
             self.set_status("No download running.")
             return
-        self._download_cancel_requested = True
+        # run_proc is racing every child against this event and takes care of the kill
+        self._download_cancel_event.set()
         self.set_status("Cancelling download…")
-        self._cancel_download_kill_proc()
 
     def _cancel_download_kill_proc(self) -> None:
-        proc = self._download_proc
-        if proc and proc.poll() is None:
+        # in-process yt_dlp downloads have no child to kill; they stop at their next progress hook
+        if self._download_cancel_event is not None:
+            try:
+                self._download_cancel_event.set()
+            except RuntimeError:
+                pass  # event loop already closed
+        for proc in list(self._download_procs):
+            if proc.returncode is not None:
+                continue
             try:
                 os.killpg(proc.pid, signal.SIGTERM)
-            except Exception:
-                try:
-                    proc.terminate()
-                except Exception:
-                    pass
+            except ProcessLookupError:
+                pass
 
     def _kickoff_download_playlist_items(self, dest_folder: str) -> None:
         dest = Path(dest_folder).expanduser()
@@ -828,11 +1358,16 @@ class MusicTUI(App):
         except Exception as e:
             self.set_status(f"Invalid folder: {e}")
             return
-        if any(t.source == "youtube" for t in self.playlist) and not shutil.which("yt-dlp"):
+        # resolved once per download rather than per item
+        self._ytdlp_path = shutil.which("yt-dlp")
+        self._ffmpeg_path = shutil.which("ffmpeg")
+        has_ytdl = self._ytdlp_path or importlib.util.find_spec("yt_dlp") is not None
+        if any(t.source == "youtube" for t in self.playlist) and not has_ytdl:
             self.set_status("yt-dlp not found.")
             return
         self._download_in_progress = True
-        self._download_cancel_requested = False
+        self._download_cancel_event = asyncio.Event()
+        self._download_procs = set()
         self._download_started_at = time.monotonic()
         self._download_cur = 0
         self._download_total = len(self.playlist)
@@ -841,7 +1376,7 @@ class MusicTUI(App):
         self._download_task = asyncio.create_task(self._download_playlist_items_async(dest))
 
     def _tick_download_panel(self) -> None:
-        dp = self.query_one("#download", DownloadPanel)
+        dp = self._download_widget
         if self._download_in_progress:
             dp.set_active(cur=self._download_cur, total=self._download_total, title=self._download_title, started_at=self._download_started_at)
         else:
@@ -851,117 +1386,220 @@ class MusicTUI(App):
         items = list(self.playlist)
 
         def title_from_label(label: str) -> str:
-            raw = re.sub(r"\[/?[^\]]+\]", "", label)
+            raw = _MARKUP_RE.sub("", label)
             raw = raw.split("  (", 1)[0].strip()
             return raw or "track"
 
-        def run_popen(cmd: List[str]) -> int:
-            p = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
-            self._download_proc = p
+        cancel_event = self._download_cancel_event
+
+        async def pump_progress(stream: asyncio.StreamReader, label: str) -> None:
+            async for line in stream:
+                m = _YTDLP_PCT_RE.search(line)
+                if m:
+                    self._download_title = f"{label}  {float(m.group(1)):.0f}%"
+
+        async def run_proc(cmd: List[str], progress_label: Optional[str] = None) -> int:
+            # with progress_label, stdout+stderr are read line by line to show the download percentage
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE if progress_label else asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.STDOUT if progress_label else asyncio.subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            self._download_procs.add(proc)
+            exit_task = asyncio.create_task(proc.wait())
+            cancel_task = asyncio.create_task(cancel_event.wait())
+            pump_task = asyncio.create_task(pump_progress(proc.stdout, progress_label)) if progress_label else None
             try:
-                while p.poll() is None and not self._download_cancel_requested:
-                    time.sleep(0.1)
-                if self._download_cancel_requested and p.poll() is None:
+                # wake on whichever comes first: child exit or the user pressing c
+                await asyncio.wait({exit_task, cancel_task}, return_when=asyncio.FIRST_COMPLETED)
+                if not exit_task.done():
                     try:
-                        os.killpg(p.pid, signal.SIGTERM)
-                    except Exception:
+                        os.killpg(proc.pid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        pass
+                    try:
+                        await asyncio.wait_for(asyncio.shield(exit_task), 1.0)
+                    except asyncio.TimeoutError:
                         try:
-                            p.terminate()
-                        except Exception:
+                            os.killpg(proc.pid, signal.SIGKILL)
+                        except ProcessLookupError:
                             pass
-                    try:
-                        p.wait(timeout=1.0)
-                    except Exception:
-                        pass
+                        await exit_task
                     return 999
-                return p.returncode or 0
+                if pump_task is not None:
+                    await pump_task
+                return proc.returncode or 0
             finally:
-                self._download_proc = None
+                cancel_task.cancel()
+                if pump_task is not None:
+                    pump_task.cancel()
+                self._download_procs.discard(proc)
+
+        # in-process yt_dlp when importable: one interpreter start + import for the whole playlist
+        ytdl = await asyncio.to_thread(load_yt_dlp) if any(t.source == "youtube" for t in items) else None
+
+        def ytdl_inprocess(url: str, outtmpl: str, label: str) -> int:
+            # runs in a worker thread; cancel is noticed at the next progress callback,
+            # so a running FFmpegExtractAudio step always finishes first
+            def hook(d: dict) -> None:
+                if cancel_event.is_set():
+                    raise ytdl.utils.DownloadCancelled()
+                total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate")
+                if d.get("status") == "downloading" and total_bytes:
+                    self._download_title = f"{label}  {100 * d.get('downloaded_bytes', 0) / total_bytes:.0f}%"
+
+            opts = {
+                "format": "bestaudio/best",
+                "outtmpl": outtmpl,
+                "noplaylist": True,
+                "quiet": True,
+                "no_warnings": True,
+                "noprogress": True,
+                "concurrent_fragment_downloads": 1,
+                "progress_hooks": [hook],
+                "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "0"}],
+                "postprocessor_args": {"ffmpeg": ["-threads", str(FFMPEG_THREADS)]},
+            }
+            try:
+                with ytdl.YoutubeDL(opts) as ydl:
+                    return ydl.download([url]) or 0
+            except Exception:
+                return 999 if cancel_event.is_set() else 1
+
+        sem = asyncio.Semaphore(DOWNLOAD_WORKERS)
+        total = len(items)
+        failures: List[str] = []
+
+        def fail(msg: str) -> None:
+            failures.append(msg)
+            self.set_status(msg)
+
+        # names and output paths are worked out up front so the workers only orchestrate I/O
+        plan: List[Tuple[str, Track, str, Path]] = []
+        for i, t in enumerate(items, start=1):
+            num = f"{i:03d}"
+            nice = title_from_label(t.label)
+            label = f"{num}/{total:03d}  {nice}"
+            if t.source == "youtube":
+                title = safe_filename(nice)
+                out = dest / f"{num} - {title}.%(ext)s"
+            else:
+                title = safe_filename(Path(t.uri).stem)
+                out = dest / f"{num} - {title}.mp3"
+            plan.append((label, t, title, out))
 
-        try:
-            for i, t in enumerate(items, start=1):
-                if self._download_cancel_requested:
-                    break
-                num = f"{i:03d}"
-                nice = title_from_label(t.label)
-                self._download_cur = i
-                self._download_title = f"{num}/{len(items):03d}  {nice}"
+        async def download_one(label: str, t: Track, title: str, out: Path) -> None:
+            async with sem:
+                if cancel_event.is_set():
+                    return
+                self._download_cur += 1
+                self._download_title = label
 
                 if t.source == "youtube":
-                    title = safe_filename(nice)
-                    outtmpl = str(dest / f"{num} - {title}.%(ext)s")
-                    cmd = [
-                        "yt-dlp",
-                        "--no-playlist",
-                        "-x",
-                        "--audio-format", "mp3",
-                        "--audio-quality", "0",
-                        "-o", outtmpl,
-                        normalize_youtube_url(t.uri),
-                    ]
-                    rc = await asyncio.to_thread(run_popen, cmd)
-                    if self._download_cancel_requested:
-                        break
-                    if rc != 0:
-                        self.set_status(f"Failed: {title} (yt-dlp exit {rc})")
-                    continue
+                    url = normalize_youtube_url(t.uri)
+                    outtmpl = str(out)
+                    if ytdl is not None:
+                        rc = await asyncio.to_thread(ytdl_inprocess, url, outtmpl, label)
+                    else:
+                        cmd = [
+                            self._ytdlp_path,
+                            "--no-playlist",
+                            "-x",
+                            "--audio-format", "mp3",
+                            "--audio-quality", "0",
+                            "--newline",
+                            "--concurrent-fragments", "1",
+                            "--postprocessor-args", f"ffmpeg:-threads {FFMPEG_THREADS}",
+                            "-o", outtmpl,
+                            url,
+                        ]
+                        rc = await run_proc(cmd, progress_label=label)
+                    if rc != 0 and not cancel_event.is_set():
+                        fail(f"Failed: {title} (yt-dlp exit {rc})")
+                    return
 
                 src = Path(t.uri)
-                if not src.exists():
-                    self.set_status(f"Missing file: {src}")
-                    continue
-
-                base_title = safe_filename(src.stem)
-                out_mp3 = dest / f"{num} - {base_title}.mp3"
+                try:
+                    st = src.stat()
+                except OSError:
+                    fail(f"Missing file: {src}")
+                    return
+                name = src.name
 
                 if src.suffix.lower() == ".mp3":
                     try:
-                        await asyncio.to_thread(shutil.copy2, src, out_mp3)
+                        await asyncio.to_thread(fast_copy, src, out, st)
                     except Exception as e:
-                        self.set_status(f"Copy failed: {src.name} ({e})")
-                    continue
+                        fail(f"Copy failed: {name} ({e})")
+                    return
 
-                if not shutil.which("ffmpeg"):
-                    self.set_status(f"ffmpeg not found (can't convert): {src.name}")
-                    continue
+                if not self._ffmpeg_path:
+                    fail(f"ffmpeg not found (can't convert): {name}")
+                    return
 
-                cmd = ["ffmpeg", "-y", "-i", str(src), "-vn", "-codec:a", "libmp3lame", "-q:a", "0", str(out_mp3)]
-                rc = await asyncio.to_thread(run_popen, cmd)
-                if self._download_cancel_requested:
-                    break
-                if rc != 0:
-                    self.set_status(f"Convert failed: {src.name} (ffmpeg exit {rc})")
+                cmd = [
+                    self._ffmpeg_path, "-y",
+                    "-threads", str(FFMPEG_THREADS),
+                    "-i", str(src),
+                    "-vn", "-codec:a", "libmp3lame", "-q:a", "0",
+                    str(out),
+                ]
+                rc = await run_proc(cmd)
+                if rc != 0 and not cancel_event.is_set():
+                    fail(f"Convert failed: {name} (ffmpeg exit {rc})")
 
-            self.set_status("Download cancelled." if self._download_cancel_requested else "Download finished.")
+        try:
+            results = await asyncio.gather(
+                *(download_one(*step) for step in plan),
+                return_exceptions=True,
+            )
+            for r in results:
+                if isinstance(r, Exception):
+                    failures.append(str(r))
+
+            if cancel_event.is_set():
+                self.set_status("Download cancelled.")
+            elif failures:
+                self.set_status(f"Download finished, {len(failures)} failed. Last: {failures[-1]}")
+            else:
+                self.set_status("Download finished.")
         except Exception as e:
             self.set_status(f"Download failed: {e}")
         finally:
             self._download_in_progress = False
-            self._download_cancel_requested = False
             self._download_cur = 0
             self._download_total = 0
             self._download_title = ""
-            self._download_proc = None
+            self._download_procs = set()
+            self._download_cancel_event = None
 
     # ---------- Playback ----------
     def _pretty_title(self, track: Track) -> str:
         if track.source == "local":
-            return Path(track.uri).name
-        return re.sub(r"\[/?[^\]]+\]", "", track.label).strip()
+            return os.path.basename(track.uri)
+        return _MARKUP_RE.sub("", track.label).strip()
 
     def _current_elapsed(self) -> float:
         if not self._playing_track:
             return 0.0
-        if self._paused:
-            return max(0.0, self._paused_at - self._play_start - self._paused_total)
-        return max(0.0, time.monotonic() - self._play_start - self._paused_total)
+        return max(0.0, (self._paused_at if self._paused else time.monotonic()) - self._elapsed_origin)
 
     def _refresh_progress_widget(self) -> None:
-        pp = self.query_one("#progress", ProgressPanel)
+        pp = self._progress_widget
         if self._playing_track:
+            elapsed = self._current_elapsed()
+            if self._duration:
+                # the timer is second-resolution; skip the re-render until something visible changes
+                # (streams without a duration keep redrawing every tick for the sweep animation)
+                key = (self._playing_title, int(elapsed), self._paused, self._shuffle_on, pp.size.width)
+                if key == self._progress_key:
+                    return
+                self._progress_key = key
             pp.set_playing(
-                self._pretty_title(self._playing_track),
-                self._current_elapsed(),
+                self._playing_title,
+                elapsed,
                 self._duration,
                 shuffle_on=self._shuffle_on,
                 paused=self._paused,
@@ -977,89 +1615,207 @@ class MusicTUI(App):
             self.set_status("YouTube playback requires mpv.")
             return
 
-        self._stop_playback()
+        self._stop_playback()  # also cancels a start still in flight
+        self._start_gen += 1
+        self._start_task = asyncio.create_task(self._start_track_async(track, source, playlist_index, self._start_gen))
 
+    async def _start_track_async(self, track: Track, source: PlaySource, playlist_index: Optional[int], gen: int) -> None:
         try:
             target = track.uri
             if track.source == "youtube":
                 self.set_status("Resolving stream…")
-                target = resolve_youtube_audio_stream(track.uri)
+                target = await resolve_youtube_audio_stream_async(track.uri)
+                if gen != self._start_gen:
+                    return  # user moved on while yt-dlp was resolving
 
             cmd = [*self._player_cmd, target]
-            self._proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            if gen != self._start_gen:
+                # another track was picked while this one was starting
+                self._terminate_player(proc)
+                return
+            self._proc = proc
+            self._exit_watch = asyncio.create_task(self._watch_player(proc))
 
             self._playing_track = track
-            self._play_start = time.monotonic()
+            self._playing_title = self._pretty_title(track)  # computed once, not per progress tick
+            self._elapsed_origin = time.monotonic()
             self._paused = False
             self._paused_at = 0.0
-            self._paused_total = 0.0
 
-            self._duration = get_duration_seconds(Path(track.uri)) if track.source == "local" else None
+            self._duration = None
+            if track.source == "local":
+                # probe in the background; the bar animates until the duration arrives
+                self._spawn(self._load_duration(track.uri, gen))
             self._play_source = source
             self._playlist_play_index = playlist_index
 
             self._refresh_progress_widget()
             self.set_status("Playing.")
         except Exception as e:
+            if gen != self._start_gen:
+                return
             self.set_status(f"Failed to play: {e}")
-            self.query_one("#progress", ProgressPanel).set_idle(shuffle_on=self._shuffle_on)
+            self._progress_widget.set_idle(shuffle_on=self._shuffle_on)
+
+    async def _load_duration(self, path: str, gen: int) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        dur = _duration_from_row(self._dur_cache.get(path), st)
+        if dur is None:
+            dur = await asyncio.to_thread(get_duration_seconds, Path(path))
+            if dur is None:
+                return
+            if _utf8_safe(path):
+                self._dur_cache[path] = [st.st_mtime_ns, st.st_size, dur]
+                async with self._dur_write_lock:
+                    # one write at a time; the snapshot is taken inside the lock so the last write has every entry
+                    await asyncio.to_thread(_write_json_atomic, DURATIONS_PATH, dict(self._dur_cache))
+        if gen == self._start_gen and self._playing_track is not None:
+            self._duration = dur
+            self._refresh_progress_widget()
 
-    def _stop_playback(self) -> None:
+    def _terminate_player(self, proc: asyncio.subprocess.Process, *, blocking: bool = False) -> None:
+        # children run with start_new_session=True, so pid == pgid; killpg only fails once the group is gone
+        if proc.returncode is not None:
+            self._dying_players.discard(proc)
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            os.killpg(proc.pid, signal.SIGCONT)  # a paused player only acts on SIGTERM once continued
+        except ProcessLookupError:
+            self._dying_players.discard(proc)
+            return
+
+        if not blocking:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                blocking = True  # loop already gone (after app.run())
+        if blocking:
+            _reap_blocking(proc.pid, 0.8)
+            self._dying_players.discard(proc)
+            return
+
+        async def reap() -> None:
+            try:
+                await asyncio.wait_for(proc.wait(), 0.8)
+            except asyncio.TimeoutError:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+            # not in a finally: if loop teardown cancels us, the exit path still finds proc here
+            self._dying_players.discard(proc)
+
+        self._dying_players.add(proc)
+        self._spawn(reap())
+
+    def _spawn(self, coro) -> asyncio.Task:
+        # fire-and-forget tasks; keep a reference so they aren't garbage collected mid-flight
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    def _stop_playback(self, *, blocking: bool = False) -> None:
+        """blocking: exit paths, where the loop may never run the async reaper; SIGKILL stragglers here."""
         proc = self._proc
         self._proc = None
+        self._progress_key = None
         self._playing_track = None
         self._duration = None
         self._play_source = None
         self._playlist_play_index = None
         self._paused = False
         self._paused_at = 0.0
-        self._paused_total = 0.0
 
-        if proc and proc.poll() is None:
+        if proc:
+            self._terminate_player(proc, blocking=blocking)
+        if blocking:
+            for dying in list(self._dying_players):
+                self._terminate_player(dying, blocking=True)
+
+        # a track still resolving or spawning must not start playing after the user stopped it
+        self._start_gen += 1
+        if self._start_task is not None and not self._start_task.done():
             try:
-                os.killpg(proc.pid, signal.SIGTERM)
-                try:
-                    proc.wait(timeout=0.8)
-                except subprocess.TimeoutExpired:
-                    os.killpg(proc.pid, signal.SIGKILL)
-            except Exception:
-                try:
-                    proc.terminate()
-                except Exception:
-                    pass
+                self._start_task.cancel()  # also kills a yt-dlp resolve still in flight
+            except RuntimeError:
+                pass  # event loop already closed
+
+        if self._progress_widget is not None:
+            self._progress_widget.set_idle(shuffle_on=self._shuffle_on)
 
-        self.query_one("#progress", ProgressPanel).set_idle(shuffle_on=self._shuffle_on)
+    async def _watch_player(self, proc: asyncio.subprocess.Process) -> None:
+        # resolved by the loop's child watcher the moment the player exits; no polling
+        await proc.wait()
+        if self._proc is proc:
+            self._on_player_exit()
+
+    def _on_player_exit(self) -> None:
+        self._proc = None
+        if self._play_source == "playlist" and self._playlist_play_index is not None:
+            nxt = self._playlist_play_index + 1
+            if nxt < len(self.playlist):
+                plv = self._playlist_widget
+                plv.index = nxt
+                self._start_track(self.playlist[nxt], source="playlist", playlist_index=nxt)
+                return
+        self._stop_playback()
 
     def _tick_progress(self) -> None:
         if not self._playing_track:
             return
-
-        if self._proc and self._proc.poll() is not None:
-            self._proc = None
-            if self._play_source == "playlist" and self._playlist_play_index is not None:
-                nxt = self._playlist_play_index + 1
-                if nxt < len(self.playlist):
-                    plv = self.query_one("#playlist", ListView)
-                    plv.index = nxt
-                    self._start_track(self.playlist[nxt], source="playlist", playlist_index=nxt)
-                    return
-            self._stop_playback()
-            return
-
         self._refresh_progress_widget()
 
     def on_shutdown(self) -> None:
-        self._stop_playback()
+        if self._search_task is not None:
+            self._search_task.cancel()
+        self._stop_playback(blocking=True)
         self._cancel_download_kill_proc()
 
 
+def _setup_event_loop() -> None:
+    # Python < 3.12 defaults to ThreadedChildWatcher (one waitpid thread per child);
+    # 3.12+ already uses pidfds and deprecates both set_child_watcher and uvloop.install
+    if sys.version_info >= (3, 12) or sys.platform == "win32":
+        return
+    try:
+        import uvloop  # optional: libuv loop, reaps children itself
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
+        return
+    if sys.platform != "linux":
+        return
+    if not hasattr(asyncio, "PidfdChildWatcher") or not hasattr(os, "pidfd_open"):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return  # kernel older than 5.3
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
 if __name__ == "__main__":
+    _setup_event_loop()
     app = MusicTUI()
     try:
         app.run()
     finally:
         try:
-            app._stop_playback()
+            app._stop_playback(blocking=True)
         except Exception:
             pass
         try: